@@ -0,0 +1,502 @@
+import os
+import sys
+import errno
+import re
+import json
+import hashlib
+import mmap
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from tqdm import tqdm
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024 * 1024  # 1 GB
+
+# integrity hashes by manifest "hash_algo" name; manifests without one are MD5
+HASHERS = {"md5": hashlib.md5}
+if blake3 is not None:
+    HASHERS["blake3"] = blake3.blake3
+if xxhash is not None:
+    HASHERS["xxh3_128"] = xxhash.xxh3_128
+
+# new splits use the fastest hash available
+DEFAULT_HASH_ALGO = "blake3" if "blake3" in HASHERS else "md5"
+
+def new_hasher(algo):
+    """Return a fresh hash object for a manifest hash algorithm name."""
+    try:
+        return HASHERS[algo]()
+    except KeyError:
+        raise ValueError(f"Unsupported or unavailable hash algorithm: {algo}") from None
+
+# per-thread read buffer reused by file_digest across files
+_local = threading.local()
+
+def read_buffer(size):
+    """Return this thread's reusable read buffer, (re)allocating it to size bytes."""
+    buf = getattr(_local, "buf", None)
+    if buf is None or len(buf) != size:
+        buf = _local.buf = bytearray(size)
+    return buf
+
+def file_digest(path, block_size=4 * 1024 * 1024, algo="md5"):
+    """Compute the checksum of a file (MD5 unless another algo is given)."""
+    h = new_hasher(algo)
+    buf = read_buffer(block_size)
+    with memoryview(buf) as view, open(path, "rb", buffering=0) as f:
+        while n := f.readinto(buf):
+            h.update(view[:n])
+    return h.hexdigest()
+
+# parts hashed ahead of a merge; a few parts stay in the page cache, a few dozen don't
+HASH_LOOKAHEAD = 2
+MAX_WINDOWS_WORKERS = 61  # ProcessPoolExecutor rejects more workers than this on Windows
+
+def file_digests(paths, algo="md5", lookahead=HASH_LOOKAHEAD):
+    """Yield (path, digest) for each path in order, hashing the files in parallel.
+
+    At most `lookahead` files are hashed ahead of the caller, so while the
+    caller handles one file the next ones are being verified and are still in
+    the page cache when it reaches them.
+    """
+    workers = max(1, lookahead)
+    if sys.platform == "win32":
+        workers = min(workers, MAX_WINDOWS_WORKERS)
+    try:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    except (NotImplementedError, OSError, ValueError):
+        # no multiprocessing support here, or the pool size was refused: hash sequentially
+        for path in paths:
+            yield path, file_digest(path, algo=algo)
+        return
+    pending = deque()
+    try:
+        for path in paths:
+            pending.append((path, pool.submit(file_digest, path, algo=algo)))
+            if len(pending) > workers:
+                done_path, future = pending.popleft()
+                yield done_path, future.result()
+        while pending:
+            done_path, future = pending.popleft()
+            yield done_path, future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def parse_size(size_str):
+    """Parse human-readable size strings like '500M', '2G', or bytes."""
+    s = size_str.strip().upper()
+    if s.endswith("G"):
+        return int(float(s[:-1]) * 1024**3)
+    if s.endswith("M"):
+        return int(float(s[:-1]) * 1024**2)
+    if s.endswith("K"):
+        return int(float(s[:-1]) * 1024)
+    return int(s)
+
+# anything other than letters, digits, "_", "." and "-"
+UNSAFE_FOLDER_CHARS = re.compile(r"[^\w.-]")
+
+def safe_folder_name(name):
+    """Replace characters not safe for folder names."""
+    return UNSAFE_FOLDER_CHARS.sub("_", name)
+
+WRITE_BLOCK = 8 * 1024 * 1024
+PROGRESS_STEP = 64 * 1024 * 1024  # progress bar granularity
+VERBOSE_PART_LIMIT = 50  # print a line per part only for jobs this small
+
+def release_pages(mm, fd, start, length):
+    """Drop an already-split region of the input from the mapping and page cache."""
+    if hasattr(mmap, "MADV_DONTNEED"):
+        aligned = start - start % mmap.PAGESIZE
+        mm.madvise(mmap.MADV_DONTNEED, aligned, start + length - aligned)
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, start, length, os.POSIX_FADV_DONTNEED)
+
+def prefetch(mm, start, length):
+    """Ask the kernel to start reading a region of the input before it is needed."""
+    if hasattr(mmap, "MADV_WILLNEED") and length > 0:
+        aligned = start - start % mmap.PAGESIZE
+        mm.madvise(mmap.MADV_WILLNEED, aligned, start + length - aligned)
+
+def write_parts(infile, output_dir, base_name, chunk_size, hash_algo, pbar):
+    """Write an open file out as numbered parts, yielding (name, size, digest) for each."""
+    fd = infile.fileno()
+    if os.fstat(fd).st_size == 0:
+        return  # an empty file cannot be mapped, and has no parts anyway
+
+    # slice the mapped file instead of read()ing it into fresh bytes objects
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        total_size = len(view)
+        idx = 1
+        offset = 0
+        while offset < total_size:
+            end = min(offset + chunk_size, total_size)
+            part_name = f"{base_name}.part{idx:03d}"
+            part_path = os.path.join(output_dir, part_name)
+
+            # hash while writing so the part never has to be read back
+            h = new_hasher(hash_algo)
+            with open(part_path, "wb") as outfile:
+                write = outfile.write
+                update = h.update
+                for step in range(offset, end, PROGRESS_STEP):
+                    step_end = min(step + PROGRESS_STEP, end)
+                    for pos in range(step, step_end, WRITE_BLOCK):
+                        # read the next block in the background while this one is written
+                        ahead = pos + WRITE_BLOCK
+                        prefetch(mm, ahead, min(WRITE_BLOCK, total_size - ahead))
+                        with view[pos:min(pos + WRITE_BLOCK, step_end)] as buf:
+                            write(buf)
+                            update(buf)
+                    pbar.update(step_end - step)
+
+            release_pages(mm, fd, offset, end - offset)
+            yield part_name, end - offset, h.hexdigest()
+            idx += 1
+            offset = end
+
+def to_json(obj):
+    """Serialize obj as compact JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass  # e.g. surrogate-escaped file names, which orjson refuses to encode
+    return json.dumps(obj).encode()
+
+def write_manifest(path, header, journal_path):
+    """Write the final manifest, streaming its parts from the split journal.
+
+    The journal holds one JSON part record per line; they are copied into the
+    "parts" list as they are read, so the full list is never held in memory.
+    """
+    with open(path, "wb") as out, open(journal_path, "rb") as journal:
+        out.write(b"{\n")
+        for key, value in header.items():
+            out.write(b"  %s: %s,\n" % (to_json(key), to_json(value)))
+        out.write(b'  "parts": [')
+        first = True
+        for line in journal:
+            out.write((b"\n    " if first else b",\n    ") + line.rstrip(b"\n"))
+            first = False
+        out.write(b"]\n}\n" if first else b"\n  ]\n}\n")
+
+def split_file(file_path, output_dir=None, chunk_size=DEFAULT_CHUNK_SIZE, hash_algo=DEFAULT_HASH_ALGO):
+    """Split a file into numbered parts plus a manifest; returns the manifest path."""
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(file_path)
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be > 0, got {chunk_size}")
+    if hash_algo not in HASHERS:
+        raise ValueError(f"Unsupported or unavailable hash algorithm: {hash_algo}")
+
+    base_name = os.path.basename(file_path)
+    total_size = os.path.getsize(file_path)
+
+    if output_dir is None or output_dir.strip() == "":
+        parent_dir = os.path.abspath(os.path.dirname(file_path) or ".")
+        output_dir = os.path.join(parent_dir, f"{base_name}_split")
+
+    os.makedirs(output_dir, exist_ok=True)
+    print(f"[info] Writing parts to: {output_dir}")
+
+    manifest_path = os.path.join(output_dir, f"{base_name}.manifest.json")
+    # parts are journaled as they are written; an interrupted split leaves this behind
+    journal_path = os.path.join(output_dir, f"{base_name}.manifest.jsonl")
+    total_parts = 0
+    print(f"\nSplitting '{base_name}' ({total_size / (1024**3):.2f} GB)...\n")
+
+    verbose = total_size <= chunk_size * VERBOSE_PART_LIMIT
+    with open(journal_path, "wb") as journal, open(file_path, "rb") as infile, tqdm(
+        total=total_size, unit="B", unit_scale=True, desc="Overall progress",
+        ncols=80, leave=True, mininterval=0.2,
+    ) as pbar:
+        for part_name, size, digest in write_parts(
+            infile, output_dir, base_name, chunk_size, hash_algo, pbar
+        ):
+            journal.write(to_json({"filename": part_name, "size": size, hash_algo: digest}) + b"\n")
+            journal.flush()
+            total_parts += 1
+            if verbose:
+                tqdm.write(f"Wrote {part_name} ({size / (1024**2):.1f} MB)")
+
+    header = {
+        "original_filename": base_name,
+        "total_parts": total_parts,
+        "chunk_size_bytes": chunk_size,
+        "hash_algo": hash_algo,
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    write_manifest(manifest_path, header, journal_path)
+    os.remove(journal_path)
+
+    print("\nSplit complete!")
+    print(f"Parts and manifest saved in:\n{output_dir}\n")
+    return manifest_path
+
+# kernel-side copies, tried in order before falling back to read/write
+ZERO_COPY = []
+if hasattr(os, "copy_file_range"):
+    ZERO_COPY.append(os.copy_file_range)
+if sys.platform.startswith("linux"):
+    ZERO_COPY.append(lambda src_fd, dst_fd, count: os.sendfile(dst_fd, src_fd, None, count))
+
+def copy_part(src_path, outfile, pbar, block_size=1024 * 1024):
+    """Append a part to outfile, keeping the bytes in the kernel where supported."""
+    with open(src_path, "rb", buffering=0) as src:
+        src_fd = src.fileno()
+        dst_fd = outfile.fileno()
+        if hasattr(os, "posix_fadvise"):
+            # widen readahead so the next block is in flight while this one is written
+            os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        outfile.flush()
+        remaining = os.fstat(src_fd).st_size
+        for copy in ZERO_COPY:
+            try:
+                while remaining and (n := copy(src_fd, dst_fd, remaining)):
+                    remaining -= n
+                    pbar.update(n)
+            except OSError:
+                continue  # e.g. EXDEV across filesystems; both offsets are still in step
+            if not remaining:
+                return
+
+        buf = bytearray(block_size)
+        view = memoryview(buf)
+        pending = 0
+        while n := src.readinto(buf):
+            outfile.write(view[:n])
+            pending += n
+            if pending >= PROGRESS_STEP:
+                pbar.update(pending)
+                pending = 0
+        pbar.update(pending)
+        outfile.flush()
+
+def preallocate(outfile, size):
+    """Reserve the output's final size up front instead of growing it per write."""
+    if size and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(outfile.fileno(), 0, size)
+        except OSError:
+            pass  # unsupported on this filesystem; the file just grows as it is written
+
+def load_manifest(path):
+    """Parse a manifest file, with orjson when it is installed."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. escaped lone surrogates from undecodable file names
+    return json.loads(data)
+
+DIRECT_ALIGN = 4096
+DIRECT_UNSUPPORTED = "[warn] O_DIRECT is not supported here; writing through the page cache"
+
+class DirectWriter:
+    """Sequential writer for an output opened with O_DIRECT, bypassing the page cache.
+
+    Data is staged in a page-aligned anonymous mmap and written out in whole
+    buffers; only the final unaligned tail is written with O_DIRECT cleared.
+    """
+
+    def __init__(self, path, buffer_size=2 * 1024 * 1024):
+        self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT, 0o666)
+        self.buf = mmap.mmap(-1, buffer_size)
+        self.view = memoryview(self.buf)
+        self.filled = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def fileno(self):
+        return self.fd
+
+    def _write(self, start, end):
+        with self.view[start:end] as data:
+            if os.write(self.fd, data) != len(data):
+                raise OSError(f"Short write to {self.fd} with O_DIRECT")
+
+    def append_part(self, src_path, pbar):
+        """Append a part to the output through the aligned staging buffer."""
+        pending = 0
+        with open(src_path, "rb", buffering=0) as src:
+            while True:
+                with self.view[self.filled:] as free:
+                    n = src.readinto(free)
+                if not n:
+                    break
+                self.filled += n
+                pending += n
+                if self.filled == len(self.buf):
+                    self._write(0, self.filled)
+                    self.filled = 0
+                if pending >= PROGRESS_STEP:
+                    pbar.update(pending)
+                    pending = 0
+        pbar.update(pending)
+
+    def truncate(self):
+        """Write out the staged tail and cut the file at the end of the data."""
+        aligned = self.filled - self.filled % DIRECT_ALIGN
+        if aligned:
+            self._write(0, aligned)
+        if aligned < self.filled:
+            flags = fcntl.fcntl(self.fd, fcntl.F_GETFL)
+            fcntl.fcntl(self.fd, fcntl.F_SETFL, flags & ~os.O_DIRECT)
+            self._write(aligned, self.filled)
+        self.filled = 0
+        os.ftruncate(self.fd, os.lseek(self.fd, 0, os.SEEK_CUR))
+
+    def close(self):
+        if self.fd < 0:
+            return
+        self.view.release()
+        self.buf.close()
+        os.close(self.fd)
+        self.fd = -1
+
+def verify_manifest(manifest_path):
+    """Check every part against the manifest without joining; returns the bad part names."""
+    manifest = load_manifest(manifest_path)
+    parts = manifest["parts"]
+    base_dir = os.path.dirname(manifest_path)
+    hash_algo = manifest.get("hash_algo", "md5")
+    if hash_algo not in HASHERS:
+        raise ValueError(f"Unsupported or unavailable hash algorithm: {hash_algo}")
+
+    bad = []
+    present = []
+    for part in parts:
+        part_path = os.path.join(base_dir, part["filename"])
+        if os.path.exists(part_path):
+            present.append((part, part_path))
+        else:
+            tqdm.write(f"Missing part: {part['filename']}")
+            bad.append(part["filename"])
+
+    print(f"\nVerifying {len(present)} parts of '{manifest['original_filename']}'...\n")
+
+    # nothing reads the parts afterwards, so hash as many at once as there are cores
+    checksums = file_digests(
+        [part_path for _, part_path in present], hash_algo, lookahead=os.cpu_count() or 1
+    )
+    with closing(checksums), tqdm(
+        total=len(present), unit="part", desc="Verifying", ncols=80, leave=True
+    ) as pbar:
+        for (part, _), (_, digest) in zip(present, checksums):
+            if digest != part[hash_algo]:
+                tqdm.write(f"Checksum mismatch in {part['filename']}")
+                bad.append(part["filename"])
+            pbar.update(1)
+
+    if bad:
+        print(f"\n{len(bad)} of {len(parts)} parts failed verification.")
+    else:
+        print(f"\nAll {len(parts)} parts verified.")
+    return bad
+
+def join_from_manifest(manifest_path, output_dir=None, direct=False):
+    """Reassemble split parts into a single file (next to the manifest by default)."""
+    manifest = load_manifest(manifest_path)
+    parts = manifest["parts"]
+
+    base_dir = os.path.dirname(manifest_path)
+    if output_dir is None:
+        output_dir = base_dir
+
+    os.makedirs(output_dir, exist_ok=True)
+    out_path = os.path.join(output_dir, manifest["original_filename"])
+    total_size = sum(p["size"] for p in parts)
+    hash_algo = manifest.get("hash_algo", "md5")
+    if hash_algo not in HASHERS:
+        raise ValueError(f"Unsupported or unavailable hash algorithm: {hash_algo}")
+
+    if direct and not (hasattr(os, "O_DIRECT") and fcntl is not None):
+        print(DIRECT_UNSUPPORTED)
+        direct = False
+
+    part_paths = [os.path.join(base_dir, part["filename"]) for part in parts]
+    for part, part_path in zip(parts, part_paths):
+        if not os.path.exists(part_path):
+            raise FileNotFoundError(f"Missing part: {part['filename']}")
+
+    print(f"\nReassembling '{manifest['original_filename']}' from {manifest['total_parts']} parts...\n")
+
+    outfile = None
+    if direct:
+        try:
+            outfile = DirectWriter(out_path)
+        except OSError as e:
+            if e.errno != errno.EINVAL:
+                raise
+            print(DIRECT_UNSUPPORTED)  # some filesystems (FUSE, older tmpfs) refuse O_DIRECT
+            direct = False
+    if outfile is None:
+        outfile = open(out_path, "wb")
+    try:
+        with outfile, tqdm(
+            total=total_size,
+            unit="B",
+            unit_scale=True,
+            desc="Merging",
+            ncols=80,
+            leave=True,
+            mininterval=0.2,
+        ) as pbar:
+            preallocate(outfile, total_size)
+
+            # later parts keep hashing in the background while earlier ones are merged
+            with closing(file_digests(part_paths, hash_algo)) as checksums:
+                for part, (part_path, digest) in zip(parts, checksums):
+                    if digest != part[hash_algo]:
+                        raise ValueError(
+                            f"Checksum mismatch in {part['filename']} "
+                            f"(expected {part[hash_algo]}, got {digest})"
+                        )
+                    if direct:
+                        outfile.append_part(part_path, pbar)
+                    else:
+                        copy_part(part_path, outfile, pbar)
+                    if len(parts) <= VERBOSE_PART_LIMIT:
+                        tqdm.write(f"Merged {part['filename']}")
+
+            # drop any preallocated space the parts did not fill
+            outfile.truncate()
+    except BaseException:
+        # a preallocated output is full-size from the start; never leave one that looks finished
+        os.remove(out_path)
+        raise
+
+    print(f"\nMerge complete! File saved to:\n{out_path}")
+    return out_path